@@ -2,6 +2,12 @@
 # app.py — XP CKPool WebUI (single-row wallet + active_workers + /api/user)
 # Robust import of local ckpool_parser.py and safe fallback to keep web UI up.
 
+import atexit
+import functools
+import hashlib
+import signal
+from bisect import bisect_right
+import json
 import os
 import re
 import sys
@@ -11,7 +17,7 @@ import importlib.util
 import traceback
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-from flask import Response, render_template, redirect, Flask, abort, jsonify, request, send_from_directory
+from flask import Response, render_template, redirect, Flask, abort, request, send_from_directory
 
 # --- .env (optional) ---
 try:
@@ -53,8 +59,28 @@ try:
 except Exception:
     AuthServiceProxy = None  # type: ignore
 
-def get_rpc() -> Optional[Any]:
-    """Return an RPC client if configured and available, else None."""
+# Constructing an AuthServiceProxy opens a new TCP connection to bitcoind
+# (and re-reads the cookie file), so cache one proxy per thread and only
+# rebuild after a caller reports a failure via _drop_rpc().
+_RPC_TL = threading.local()
+_COOKIE_CACHE: Dict[str, Any] = {"mtime": None, "creds": ""}
+
+def _cookie_creds() -> str:
+    """Cookie credentials, re-read only when the file's mtime changes."""
+    try:
+        mtime = os.stat(BTC_COOKIE_PATH).st_mtime
+    except OSError:
+        return ""
+    if _COOKIE_CACHE["mtime"] != mtime:
+        try:
+            with open(BTC_COOKIE_PATH, "r", encoding="utf-8") as f:
+                _COOKIE_CACHE["creds"] = f.read().strip()
+            _COOKIE_CACHE["mtime"] = mtime
+        except Exception:
+            return ""
+    return _COOKIE_CACHE["creds"]
+
+def _new_rpc() -> Optional[Any]:
     if not AuthServiceProxy:
         return None
     if BTC_RPC_URL:
@@ -62,35 +88,49 @@ def get_rpc() -> Optional[Any]:
             return AuthServiceProxy(BTC_RPC_URL)
         except Exception:
             pass
-    if BTC_COOKIE_PATH and os.path.exists(BTC_COOKIE_PATH):
-        try:
-            with open(BTC_COOKIE_PATH, "r", encoding="utf-8") as f:
-                creds = f.read().strip()
-            return AuthServiceProxy(f"http://{creds}@{BTC_RPC_HOST}:{BTC_RPC_PORT}")
-        except Exception:
-            return None
+    if BTC_COOKIE_PATH:
+        creds = _cookie_creds()
+        if creds:
+            try:
+                return AuthServiceProxy(f"http://{creds}@{BTC_RPC_HOST}:{BTC_RPC_PORT}")
+            except Exception:
+                return None
     return None
 
+def get_rpc() -> Optional[Any]:
+    """Return this thread's cached RPC client, creating it on first use."""
+    rpc = getattr(_RPC_TL, "rpc", None)
+    if rpc is None:
+        rpc = _new_rpc()
+        _RPC_TL.rpc = rpc
+    return rpc
+
+def _drop_rpc() -> None:
+    """Forget this thread's RPC client so the next get_rpc() reconnects."""
+    _RPC_TL.rpc = None
+
 # --- Pool fee helper for About page ---
 FEE_KEYS = ["donationpercent","donation_percent","fee_percent","pool_fee","fee","operator_fee","donation"]
 
+# One compiled pattern matches a fee key and captures its numeric value in a
+# single pass per line (instead of a re.split + re.search + list membership).
+_FEE_RE = re.compile(
+    r"^\s*(?:" + "|".join(map(re.escape, FEE_KEYS)) + r")\s*[=\s]\s*[\"']?([-+]?\d*\.?\d+)",
+    re.IGNORECASE,
+)
+
 def _read_fee_from_conf(path: str):
     if not path or not os.path.exists(path):
         return None
     try:
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.startswith("#") or line.startswith(";"):
-                    continue
-                parts = re.split(r"\s*=\s*|\s+", line, maxsplit=1)
-                if len(parts) != 2:
+            for line in f:
+                stripped = line.lstrip()
+                if not stripped or stripped[0] in "#;":
                     continue
-                key, val = parts[0].strip().lower(), parts[1].strip()
-                if key in FEE_KEYS:
-                    m = re.search(r"[-+]?\d*\.?\d+", val)
-                    if m:
-                        return float(m.group(0))
+                m = _FEE_RE.match(stripped)
+                if m:
+                    return float(m.group(1))
     except Exception:
         return None
     return None
@@ -176,46 +216,90 @@ else:
 
 # --- Parser / DB state ---
 from pathlib import Path
+from contextlib import contextmanager
+import queue
 import sqlite3
 import sys
 import types
 
 DB_PATH = Path(CKPOOL_DB)
 
-def get_db() -> sqlite3.Connection:
+# Bounded pool of long-lived read connections. Opening a sqlite connection and
+# re-applying PRAGMAs per request is pure overhead on the read-only API paths,
+# so connections are created once (PRAGMAs already set) and recycled.
+_POOL_SIZE = max(4, REFRESH_SEC)
+_POOL: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=_POOL_SIZE)
+
+def _ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create the query indexes on every connection, whichever path opened it."""
+    try:
+        # lets the last-seen GROUP BY in /api/pool run index-bound
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS workers_seen_wallet_ls "
+            "ON workers_seen(wallet, last_seen);"
+        )
+        # covering index for the active-worker listing in /api/wallet/.../workers
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_workers_seen_wallet_active_ls "
+            "ON workers_seen(wallet, active, last_seen DESC);"
+        )
+    except Exception:
+        pass
+
+def _new_db_conn() -> sqlite3.Connection:
     """
-    Open a fresh connection and ensure DB schema exists. Use helpers from the
-    loaded _ckpool_parser module when available; otherwise fall back to a
-    resilient sqlite connection.
+    Create one long-lived connection with PRAGMAs applied and schema ensured.
+    Always opened here rather than via the parser's _connect: pooled
+    connections are built at import but served to request threads, so they
+    need check_same_thread=False, which the parser makes no promise about.
+    Rows stay plain tuples — the read paths index positionally, and that
+    skips a Row object allocation per row; routes that want named columns
+    set sqlite3.Row on their own cursor.
     """
-    # If the module was loaded successfully, use its _connect/init_db helpers
+    conn = sqlite3.connect(str(DB_PATH), timeout=30.0, check_same_thread=False,
+                           isolation_level=None)
+    # Ensure the schema via the parser's init_db when the module is present.
     if _ckpool_parser:
         try:
-            _connect = getattr(_ckpool_parser, "_connect")
-            init_db = getattr(_ckpool_parser, "init_db")
-            conn = _connect(DB_PATH)
-            try:
-                init_db(conn)
-            except Exception:
-                pass
-            return conn
+            _ckpool_parser.init_db(conn)
         except Exception:
-            # fall back to plain sqlite below
             pass
-
-    # Fallback sqlite connection
-    conn = sqlite3.connect(str(DB_PATH), timeout=30.0, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
     try:
         cur = conn.cursor()
         cur.execute("PRAGMA journal_mode=WAL;")
         cur.execute("PRAGMA synchronous=NORMAL;")
         cur.execute("PRAGMA busy_timeout=10000;")
-        conn.commit()
     except Exception:
         pass
+    _ensure_indexes(conn)
     return conn
 
+# Populate the pool once at import; failures here must not keep the UI down.
+try:
+    for _ in range(_POOL_SIZE):
+        _POOL.put_nowait(_new_db_conn())
+except Exception:
+    pass
+
+@contextmanager
+def db_conn():
+    """Borrow a pooled connection; it is returned to the pool on exit."""
+    try:
+        conn = _POOL.get_nowait()
+    except queue.Empty:
+        # Pool exhausted (or never populated): open a temporary connection.
+        conn = _new_db_conn()
+    try:
+        yield conn
+    finally:
+        try:
+            _POOL.put_nowait(conn)
+        except queue.Full:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
 # Wire up parser exports from the previously-loaded _ckpool_parser module
 try:
     if not _ckpool_parser:
@@ -255,74 +339,321 @@ except Exception as e:
 # --- Flask ---
 app = Flask(__name__, static_folder="static", template_folder="templates")
 app.config["TEMPLATES_AUTO_RELOAD"] = True
+# static assets are fingerprint-free but change rarely; let browsers keep
+# them for a day instead of refetching on every dashboard reload
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 86400
+
+# --- JSON encoding (optional orjson) ---
+# orjson encodes the large /api/pool payloads several times faster than the
+# stdlib encoder; fall back silently so the UI still runs without it.
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
+def _json_dumps(obj: Any) -> bytes:
+    # default=str covers types orjson won't encode natively — notably the
+    # Decimals AuthServiceProxy returns for JSON-RPC floats like difficulty.
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+# JSON responses are cacheable for one refresh interval and carry a
+# content-hash ETag, so pollers whose data hasn't changed get a bodyless
+# 304 instead of the full payload.
+JSON_MAX_AGE = max(1, REFRESH_SEC)
+
+def jsonify(obj: Any, max_age: int = JSON_MAX_AGE) -> Response:
+    # shadows flask.jsonify for all API routes below
+    body = _json_dumps(obj)
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    if request.headers.get("If-None-Match") == etag:
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype="application/json")
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return resp
+
+def _no_store(view):
+    """Mark a live HTML page as uncacheable; replaces the old blanket
+    after_request header that also defeated caching on the JSON APIs."""
+    @functools.wraps(view)
+    def wrapped(*args, **kwargs):
+        resp = app.make_response(view(*args, **kwargs))
+        resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        resp.headers["Pragma"] = "no-cache"
+        resp.headers["Expires"] = "0"
+        return resp
+    return wrapped
 
 @app.context_processor
 def inject_site():
     return {"SITE_NAME": SITE_NAME, "SITE_TAGLINE": SITE_TAGLINE, "now": datetime.utcnow}
 
-def _bg_refresh():
-    while True:
-        try:
-            state.refresh()
-        except Exception:
-            # swallow; don't let background thread crash
-            pass
-        time.sleep(max(1, REFRESH_SEC))
-
-threading.Thread(target=_bg_refresh, daemon=True).start()
+# Refresh signalling: _SNAP_VER is bumped after every successful
+# state.refresh() and _FRESH_COND wakes any request waiting for it
+# (see /api/pool?wait=1). A Condition plus version counter avoids the
+# set/clear race an Event pulse would have.
+_FRESH_COND = threading.Condition()
+_SNAP_VER = 0
+
+def _wait_for_fresh(timeout: float) -> bool:
+    """Block until the next snapshot refresh (or timeout); True if refreshed."""
+    with _FRESH_COND:
+        ver = _SNAP_VER
+        return _FRESH_COND.wait_for(lambda: _SNAP_VER != ver, timeout=timeout)
+
+def _refresh_once():
+    global _SNAP_VER
+    state.refresh()
+    with _FRESH_COND:
+        _SNAP_VER += 1
+        _FRESH_COND.notify_all()
 
 from datetime import datetime
 
+# strftime is locale-aware and surprisingly expensive when called once per
+# row; format from the gmtime tuple instead and memoize on the int timestamp
+# so repeated values across rows (and across requests) are free.
+
+@functools.lru_cache(maxsize=8192)
+def _iso_utc(ts: int) -> str:
+    tm = time.gmtime(ts)
+    return (f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+            f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}Z")
+
+@functools.lru_cache(maxsize=8192)
+def _human_utc(ts: int) -> str:
+    tm = time.gmtime(ts)
+    return (f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d} "
+            f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d} UTC")
+
 @app.template_filter('datetimeformat')
 def datetimeformat(value):
     try:
-        return datetime.utcfromtimestamp(int(value)).strftime('%Y-%m-%d %H:%M:%S UTC')
+        return _human_utc(int(value))
     except Exception:
         return ''
 
 # ========== In-memory hashrate history (24h rolling) ==========
-from collections import defaultdict, deque
+from array import array
 
 HIST_WINDOW_SEC   = int(os.getenv("HIST_WINDOW_SEC", str(24 * 3600)))
 SAMPLE_EVERY_SEC  = int(os.getenv("SAMPLE_EVERY_SEC", "30"))
 
-HISTORY = defaultdict(lambda: deque(maxlen=HIST_WINDOW_SEC // max(1, SAMPLE_EVERY_SEC)))
+# History is stored struct-of-arrays instead of a dict of deques of (ts, v)
+# tuples: one shared timestamp ring plus a float ring per wallet, all aligned
+# on the same head. Each sample costs two machine words instead of an
+# ~80-byte tuple, and reads are C-level array indexing.
+N_SLOTS = max(1, HIST_WINDOW_SEC // max(1, SAMPLE_EVERY_SEC))
+
+_HIST_TS = array("q", bytes(8 * N_SLOTS))    # sample timestamps (0 = empty slot)
+_HIST_HR: Dict[str, array] = {}              # wallet -> float ring aligned to _HIST_TS
+_HIST_HEAD = -1                              # index of newest sample
+_HIST_COUNT = 0                              # number of filled slots
+_HIST_LOCK = threading.Lock()
+
+def _history_columns(addr: str, cutoff: int) -> tuple:
+    """Samples for addr at or after cutoff as parallel (ts, v) lists, oldest first."""
+    ts_col: List[int] = []
+    v_col: List[float] = []
+    with _HIST_LOCK:
+        ring = _HIST_HR.get(addr)
+        if ring is None or _HIST_COUNT == 0:
+            return ts_col, v_col
+        start = (_HIST_HEAD - _HIST_COUNT + 1) % N_SLOTS
+        for i in range(_HIST_COUNT):
+            j = (start + i) % N_SLOTS
+            ts = _HIST_TS[j]
+            if ts >= cutoff:
+                ts_col.append(ts)
+                v_col.append(ring[j])
+        return ts_col, v_col
+
+def _rate1m(u: Dict[str, Any]) -> float:
+    try:
+        return float(u.get("hashrate1m") or 0)
+    except Exception:
+        return 0.0
 
-def _bg_sampler():
-    while True:
-        try:
-            snap = state.snapshot()
-            ts = int(time.time())
-            for u in (snap.get("users") or []):
-                addr = u.get("wallet") or u.get("address")
-                if not addr:
-                    continue
-                try:
-                    v = float(u.get("hashrate1m") or 0)
-                except Exception:
-                    v = 0.0
-                HISTORY[addr].append((ts, v))
-        except Exception:
-            pass
-        time.sleep(max(1, SAMPLE_EVERY_SEC))
+def _sample_once():
+    global _HIST_HEAD, _HIST_COUNT
+    snap = state.snapshot()
+    ts = int(time.time())
+    # extract (addr, value) pairs before taking the lock, in one batched
+    # comprehension — the lock then only covers the ring writes
+    rows = [
+        (u.get("wallet") or u.get("address"), _rate1m(u))
+        for u in (snap.get("users") or [])
+        if u.get("wallet") or u.get("address")
+    ]
+    with _HIST_LOCK:
+        head = (_HIST_HEAD + 1) % N_SLOTS
+        _HIST_TS[head] = ts
+        # zero the slot being recycled so wallets missing from this
+        # sample don't keep a day-old value
+        for ring in _HIST_HR.values():
+            ring[head] = 0.0
+        for addr, v in rows:
+            ring = _HIST_HR.get(addr)
+            if ring is None:
+                ring = array("f", bytes(4 * N_SLOTS))
+                _HIST_HR[addr] = ring
+            ring[head] = v
+        _HIST_HEAD = head
+        _HIST_COUNT = min(_HIST_COUNT + 1, N_SLOTS)
+
+# Set on shutdown; the scheduler blocks on it instead of time.sleep so a
+# SIGTERM wakes it immediately rather than after a full period.
+_STOP = threading.Event()
+
+def _bg_scheduler():
+    """
+    Single background thread driving both periodic jobs: snapshot refresh
+    every REFRESH_SEC and hashrate sampling every SAMPLE_EVERY_SEC. One
+    thread means one timeline of coalesced wake-ups instead of two loops
+    context-switching independently. Deadlines are aligned to wall-clock
+    period boundaries and advanced by whole periods so sampling doesn't
+    drift by the job's own runtime.
+    """
+    refresh_every = max(1, REFRESH_SEC)
+    sample_every = max(1, SAMPLE_EVERY_SEC)
+    next_refresh = (int(time.time()) // refresh_every + 1) * refresh_every
+    next_sample = (int(time.time()) // sample_every + 1) * sample_every
+    while not _STOP.is_set():
+        now = time.time()
+        if now >= next_refresh:
+            try:
+                _refresh_once()
+            except Exception:
+                # swallow; don't let background thread crash
+                pass
+            while next_refresh <= now:
+                next_refresh += refresh_every
+        if now >= next_sample:
+            try:
+                _sample_once()
+            except Exception:
+                pass
+            while next_sample <= now:
+                next_sample += sample_every
+        _STOP.wait(max(0.05, min(next_refresh, next_sample) - time.time()))
+
+_SCHED_THREAD = threading.Thread(target=_bg_scheduler, daemon=True)
+_SCHED_THREAD.start()
 
-threading.Thread(target=_bg_sampler, daemon=True).start()
+def _shutdown_bg():
+    _STOP.set()
+    try:
+        _SCHED_THREAD.join(timeout=5)
+    except Exception:
+        pass
+
+atexit.register(_shutdown_bg)
+
+try:
+    _prev_sigterm = signal.getsignal(signal.SIGTERM)
+
+    def _on_sigterm(signum, frame):
+        _shutdown_bg()
+        # chain whatever was installed before us (gunicorn's worker handler
+        # in production, the default action under the dev server)
+        if callable(_prev_sigterm):
+            _prev_sigterm(signum, frame)
+        else:
+            sys.exit(0)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+except Exception:
+    # signals can only be set from the main thread; atexit still covers us
+    pass
 # ==================================================================
 
 # ---------- helpers ----------
 
+# Indexes derived from the snapshot, rebuilt at most once per refresh.
+# state.snapshot() hands back the same object until the background refresh
+# replaces it, so id(snap) works as a cheap version key; keeping a reference
+# to the snapshot inside the cache stops the id from being recycled.
+#
+# For search, the per-user lowercased fields are packed into one flat string
+# ("\x00" between fields, "\x01" between rows) with a parallel row-offset
+# list. A query is then a handful of C-level str.find calls over one buffer
+# instead of a Python-interpreted `in` test per user.
+_SNAP_CACHE: Dict[str, Any] = {
+    "key": None, "snap": None, "by_wallet": {},
+    "users": [], "flat": "", "starts": [],
+}
+_SNAP_LOCK = threading.Lock()
+
+def _snap_cached() -> Dict[str, Any]:
+    """Return the current snapshot plus per-snapshot lookup indexes."""
+    snap = state.snapshot() or {"pool": {}, "users": [], "totals": {}}
+    cache = _SNAP_CACHE
+    if cache["key"] == id(snap):
+        return cache
+    with _SNAP_LOCK:
+        cache = _SNAP_CACHE
+        if cache["key"] == id(snap):
+            return cache
+        users = list(snap.get("users") or [])
+        by_wallet: Dict[str, Dict[str, Any]] = {}
+        hays: List[str] = []
+        for u in users:
+            wallet = u.get("wallet") or u.get("address")
+            if wallet:
+                by_wallet[wallet] = u
+            hays.append("\x00".join(
+                str(f).lower()
+                for f in (u.get("address"), u.get("wallet"), u.get("user"), u.get("worker"))
+                if f
+            ))
+        starts: List[int] = []
+        pos = 0
+        for hay in hays:
+            starts.append(pos)
+            pos += len(hay) + 1  # +1 for the row separator
+        cache = {
+            "key": id(snap), "snap": snap, "by_wallet": by_wallet,
+            "users": users, "flat": "\x01".join(hays), "starts": starts,
+            # prebuilt objects for the dashboard render, so coin_page doesn't
+            # re-copy the snapshot dict and re-slice users on every request
+            "pool_obj": types.SimpleNamespace(**snap),
+            "top_users": users[:100],
+        }
+        globals()["_SNAP_CACHE"] = cache
+        return cache
+
+def _search_users(ql: str) -> List[Dict[str, Any]]:
+    """All users whose indexed fields contain the lowercased query."""
+    cache = _snap_cached()
+    flat = cache["flat"]
+    starts = cache["starts"]
+    users = cache["users"]
+    res: List[Dict[str, Any]] = []
+    if not ql:
+        return res
+    pos = flat.find(ql)
+    while pos != -1:
+        row = bisect_right(starts, pos) - 1
+        res.append(users[row])
+        # resume after this row so each user matches at most once
+        end = starts[row + 1] - 1 if row + 1 < len(starts) else len(flat)
+        pos = flat.find(ql, end)
+    return res
+
 def _find_wallet_row(wallet: str) -> Optional[Dict[str, Any]]:
-    snap = state.snapshot()
-    for u in (snap.get("users") or []):
-        if (u.get("wallet") or u.get("address")) == wallet:
-            return u
-    return None
+    return _snap_cached()["by_wallet"].get(wallet)
 
-def wallet_last_seen_map(conn: sqlite3.Connection) -> Dict[str, Optional[int]]:
-    out: Dict[str, Optional[int]] = {}
+def wallet_last_seen_map(conn: sqlite3.Connection, cutoff: int) -> Dict[str, int]:
+    """Map of wallet -> last_seen for wallets seen at or after cutoff."""
+    out: Dict[str, int] = {}
     try:
         cur = conn.execute(
-            "SELECT wallet, MAX(last_seen) as last_seen FROM workers_seen GROUP BY wallet;"
+            "SELECT wallet, MAX(last_seen) as last_seen FROM workers_seen "
+            "WHERE last_seen>=? GROUP BY wallet;",
+            (cutoff,),
         )
     except Exception:
         return {}
@@ -331,9 +662,9 @@ def wallet_last_seen_map(conn: sqlite3.Connection) -> Dict[str, Optional[int]]:
         try:
             w = r[0]
             ts = r[1]
-            if w is None:
+            if w is None or ts is None:
                 continue
-            out[w] = int(ts) if ts is not None else None
+            out[w] = int(ts)
         except Exception:
             continue
     return out
@@ -341,11 +672,13 @@ def wallet_last_seen_map(conn: sqlite3.Connection) -> Dict[str, Optional[int]]:
 # ---------- Pages ----------
 
 @app.route("/")
+@_no_store
 def index():
     # just render a landing / coin selector page
     return render_template("home.html")
 
 @app.route("/coin/<coin>")
+@_no_store
 def coin_page(coin: str):
     coin_l = coin.lower()
     if coin_l != "btc":
@@ -353,9 +686,9 @@ def coin_page(coin: str):
         return render_template("unavailable.html", coin=coin)
 
     # normal BTC dashboard
-    snap = state.snapshot() or {"pool": {}, "users": [], "totals": {}}
-    pool_obj = types.SimpleNamespace(**snap)
-    users = (snap.get("users") or [])[:100]
+    cache = _snap_cached()
+    pool_obj = cache["pool_obj"]
+    users = cache["top_users"]
 
     node = {}
     rpc = get_rpc()
@@ -368,12 +701,14 @@ def coin_page(coin: str):
             }
         except Exception:
             node = {}
+            _drop_rpc()
 
     return render_template("index.html", pool=pool_obj, node=node, users=users, coin=coin)
 
 
 
 @app.route("/node")
+@_no_store
 def node_page():
     node = {}
     rpc = get_rpc()
@@ -387,9 +722,11 @@ def node_page():
             }
         except Exception:
             node = {}
+            _drop_rpc()
     return render_template("node.html", node=node)
 
 @app.route("/miners")
+@_no_store
 def miners_page():
     snap = state.snapshot()
     users = snap.get("users") or []
@@ -399,19 +736,19 @@ def miners_page():
     return render_template("miners.html", users=users[start:end], page=page, size=size)
 
 @app.route("/blocks")
+@_no_store
 def blocks_page():
     # coin may be passed as query param ?coin=btc ; keep same behavior as other pages
     coin = (request.args.get("coin") or "btc")
     try:
-        conn = get_db()
-        rows = conn.execute(
-            "SELECT height, blockhash, ts, reward_btc, txid, address "
-            "FROM blocks ORDER BY ts DESC LIMIT 100;"
-        ).fetchall()
-        try:
-            conn.close()
-        except Exception:
-            pass
+        with db_conn() as conn:
+            cur = conn.cursor()
+            cur.arraysize = 128
+            cur.execute(
+                "SELECT height, blockhash, ts, reward_btc, txid, address "
+                "FROM blocks ORDER BY ts DESC LIMIT 100;"
+            )
+            rows = cur.fetchall()
     except Exception:
         # fallback to empty list on DB error
         rows = []
@@ -442,6 +779,7 @@ def blocks_page():
 
 
 @app.route("/connections")
+@_no_store
 def connections_page():
     try:
         conns = state.connections_snapshot()
@@ -450,25 +788,23 @@ def connections_page():
     return render_template("connections.html", connections=conns)
 
 @app.route("/search")
+@_no_store
 def search_page():
     q = (request.args.get("q") or "").strip()
     matches: List[Dict[str, Any]] = []
     if q:
-        ql = q.lower()
-        snap = state.snapshot()
-        for u in (snap.get("users") or []):
-            fields = [(u.get("address") or ""), (u.get("wallet") or ""), (u.get("user") or ""), (u.get("worker") or "")]
-            if any(ql in str(f).lower() for f in fields if f):
-                matches.append(u)
+        matches = _search_users(q.lower())
     return render_template("search.html", q=q, matches=matches)
 
 @app.route("/about")
+@_no_store
 def about_page():
     info = {"fee": get_pool_fee_pct(), "ckpool_conf": os.getenv("CKPOOL_CONF", "")}
     return render_template("about.html", info=info)
 
 # ---- Wallet detail ----
 @app.route("/wallet/<addr>")
+@_no_store
 def wallet_page(addr: str):
     row = _find_wallet_row(addr)
 
@@ -495,15 +831,18 @@ def wallet_page(addr: str):
     return render_template("wallet.html", addr=addr, agg=agg, row=row)
 
 @app.route("/rewards")
+@_no_store
 def rewards_page():
     # read from blocks table (ckpool_parser stores block rewards there)
     try:
-        conn = get_db()
-        rows = conn.execute(
-            "SELECT height, blockhash, ts, reward_btc, txid, address FROM blocks ORDER BY ts DESC LIMIT 50;"
-        ).fetchall()
-        try: conn.close()
-        except Exception: pass
+        with db_conn() as conn:
+            cur = conn.cursor()
+            cur.row_factory = sqlite3.Row  # template reads named columns
+            cur.arraysize = 128
+            cur.execute(
+                "SELECT height, blockhash, ts, reward_btc, txid, address FROM blocks ORDER BY ts DESC LIMIT 50;"
+            )
+            rows = cur.fetchall()
     except Exception:
         rows = []
     return render_template(
@@ -520,27 +859,33 @@ def xpgame_redirect():
     return redirect("https://xpfun.lol", code=301)
 
 # ---- Rewards (HTML + API) ----
-@app.get("/wallet/<address>/rewards")
-def wallet_rewards_page(address: str):
+def _wallet_rewards(address: str) -> List[Any]:
+    """
+    Fetch rewards through the parser's get_wallet_rewards. That helper is
+    external code written against Row-style connections (its own _connect
+    sets sqlite3.Row), so give the borrowed connection a Row factory for
+    the call and restore tuple rows before returning it to the pool.
+    """
     try:
-        conn = get_db()
-        rows = get_wallet_rewards(conn, address)
-        try: conn.close()
-        except: pass
+        with db_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            try:
+                return get_wallet_rewards(conn, address)
+            finally:
+                conn.row_factory = None
     except Exception:
-        rows = []
+        return []
+
+@app.get("/wallet/<address>/rewards")
+@_no_store
+def wallet_rewards_page(address: str):
+    rows = _wallet_rewards(address)
     return render_template("rewards.html", address=address, rewards=rows,
                            explorer_tx=EXPLORER_TX, explorer_block=EXPLORER_BLOCK)
 
 @app.get("/api/wallet/<address>/rewards")
 def wallet_rewards_api(address: str):
-    try:
-        conn = get_db()
-        rows = get_wallet_rewards(conn, address)
-        try: conn.close()
-        except: pass
-    except Exception:
-        rows = []
+    rows = _wallet_rewards(address)
     out = []
     for r in rows:
         out.append({
@@ -556,10 +901,58 @@ def wallet_rewards_api(address: str):
 
 # ---------- APIs ----------
 
+# TTL caches for the hot JSON endpoints. The snapshot changes at most once
+# per REFRESH_SEC, so N concurrent dashboard pollers can share one compute +
+# serialize instead of each paying for their own.
+_POOL_CACHE: Dict[str, Any] = {"exp": 0.0, "body": b"", "etag": ""}
+_NODE_CACHE: Dict[str, Any] = {"exp": 0.0, "body": b"", "etag": ""}
+_JSON_CACHE_LOCK = threading.Lock()
+NODE_TTL_SEC = float(os.getenv("NODE_TTL_SEC", "2"))
+
+def _cached_json_response(cache: Dict[str, Any], ttl: float, compute) -> Response:
+    """Serve cached JSON bytes, recomputing inline once the TTL has expired."""
+    if time.monotonic() >= cache["exp"]:
+        with _JSON_CACHE_LOCK:
+            if time.monotonic() >= cache["exp"]:
+                body = _json_dumps(compute())
+                cache["body"] = body
+                cache["etag"] = hashlib.blake2b(body, digest_size=8).hexdigest()
+                cache["exp"] = time.monotonic() + ttl
+    etag = cache["etag"]
+    if request.headers.get("If-None-Match") == etag:
+        resp = Response(status=304)
+    else:
+        resp = Response(cache["body"], mimetype="application/json")
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = f"public, max-age={max(1, int(ttl))}"
+    return resp
+
+# The workers_seen table only changes when the parser ingests log lines
+# during a refresh, so the GROUP BY behind the last-seen map is memoized on
+# the refresh version counter: it runs at most once per refresh, not once
+# per request. The cutoff drifts by at most REFRESH_SEC within one cached
+# generation, which is noise against the 300s worker timeout.
+_LS_CACHE: Dict[str, Any] = {"ver": -1, "map": {}}
+
+def _last_seen_cached(cutoff: int) -> Dict[str, int]:
+    if _LS_CACHE["ver"] != _SNAP_VER:
+        with db_conn() as conn:
+            _LS_CACHE["map"] = wallet_last_seen_map(conn, cutoff)
+        _LS_CACHE["ver"] = _SNAP_VER
+    return _LS_CACHE["map"]
+
 @app.get("/api/pool")
 def api_pool():
-    snap = state.snapshot()
-    users = (snap.get("users") or [])
+    if request.args.get("wait"):
+        # long-poll: block until the next refresh lands, then serve it fresh
+        if _wait_for_fresh(timeout=min(2 * max(1, REFRESH_SEC), 30)):
+            _POOL_CACHE["exp"] = 0.0
+    return _cached_json_response(_POOL_CACHE, REFRESH_SEC, _compute_pool_snap)
+
+def _compute_pool_snap() -> Dict[str, Any]:
+    cache = _snap_cached()
+    snap = cache["snap"]
+    by_wallet = cache["by_wallet"]
 
     try:
         timeout_s = int(os.getenv("WORKER_TIMEOUT", "300"))
@@ -569,45 +962,39 @@ def api_pool():
     cutoff = now - max(0, timeout_s)
 
     try:
-        conn = get_db()
-        try:
-            last_map = wallet_last_seen_map(conn)
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        last_map = _last_seen_cached(cutoff)
     except Exception:
         last_map = {}
 
+    # The cutoff filter happens in SQL, so only |active wallets| rows come
+    # back; join them against the in-memory index instead of walking every
+    # user per request.
     filtered = []
-    for u in users:
-        wallet = u.get("wallet") or u.get("address") or (u.get("user") and str(u.get("user")).split('.', 1)[0])
-        last_ts = None
-        if wallet:
-            last_ts = last_map.get(wallet)
-
-        # attach last_seen metadata
-        u["last_seen_ts"] = int(last_ts) if last_ts else None
+    for wallet, last_ts in last_map.items():
+        u = by_wallet.get(wallet)
+        if u is None:
+            continue
+        u["last_seen_ts"] = last_ts
         try:
-            u["last_seen"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(u["last_seen_ts"])) if u["last_seen_ts"] else None
+            u["last_seen"] = _iso_utc(last_ts)
         except Exception:
             u["last_seen"] = None
+        filtered.append(u)
 
-        keep = False
-        if u.get("last_seen_ts") is not None and u["last_seen_ts"] >= cutoff:
-            keep = True
-        else:
+    if not last_map:
+        # DB empty or unavailable: fall back to the snapshot-only heuristic
+        # so a pool without parser history still shows its hashing users.
+        for u in (snap.get("users") or []):
+            u.setdefault("last_seen_ts", None)
+            u.setdefault("last_seen", None)
             try:
                 if float(u.get("hashrate1m") or 0) > 0:
-                    keep = True
+                    filtered.append(u)
+                    continue
             except Exception:
                 pass
-            if not keep and isinstance(u.get("active_workers"), list) and len(u.get("active_workers")) > 0:
-                keep = True
-
-        if keep:
-            filtered.append(u)
+            if isinstance(u.get("active_workers"), list) and len(u.get("active_workers")) > 0:
+                filtered.append(u)
 
     out_snap = dict(snap)
     out_snap["users"] = filtered
@@ -625,18 +1012,39 @@ def api_pool():
                     bh = rpc.getbestblockhash()
                     out_snap.setdefault("pool", {})["bestblockhash"] = str(bh)
                 except Exception:
-                    pass
+                    _drop_rpc()
     except Exception:
         pass
 
-    return jsonify(out_snap)
+    return out_snap
 
 @app.get("/api/node")
 def api_node():
+    return _cached_json_response(_NODE_CACHE, NODE_TTL_SEC, _compute_node)
+
+def _compute_node() -> Dict[str, Any]:
     rpc = get_rpc()
     if not rpc:
-        return jsonify({})
-    data = {}
+        return {}
+    data: Dict[str, Any] = {}
+    # One JSON-RPC batch instead of four serial HTTP round-trips.
+    try:
+        block, difficulty, connections, besthash = rpc.batch_([
+            ["getblockcount"],
+            ["getdifficulty"],
+            ["getconnectioncount"],
+            ["getbestblockhash"],
+        ])
+        return {
+            "block": int(block),
+            "difficulty": difficulty,
+            "connections": int(connections),
+            "bestblockhash": besthash,
+        }
+    except Exception:
+        # proxy without batch_ support, or a dead connection: fall back to
+        # the serial calls below
+        pass
     try:
         data["block"] = int(rpc.getblockcount())
     except Exception:
@@ -653,19 +1061,17 @@ def api_node():
         data["bestblockhash"] = rpc.getbestblockhash()
     except Exception:
         pass
-    return jsonify(data)
+    if not data:
+        # nothing answered: assume the connection is dead and reconnect next time
+        _drop_rpc()
+    return data
 
 @app.get("/api/search")
 def api_search():
     q = (request.args.get("q") or "").strip()
     res: List[Dict[str, Any]] = []
     if q:
-        ql = q.lower()
-        snap = state.snapshot()
-        for u in (snap.get("users") or []):
-            fields = [(u.get("address") or ""), (u.get("wallet") or ""), (u.get("user") or ""), (u.get("worker") or "")]
-            if any(ql in str(f).lower() for f in fields if f):
-                res.append(u)
+        res = _search_users(q.lower())
     return jsonify({"query": q, "matches": res})
 
 @app.get("/api/user/<wallet>")
@@ -692,21 +1098,36 @@ def api_wallet_workers(wallet: str):
         timeout_s = 300
     now = int(time.time())
 
+    # Optional keyset cursor: pass the last_seen of the last row you got as
+    # ?before=<ts> instead of a deep OFFSET (OFFSET re-scans prefix rows).
+    try:
+        before_ts: Optional[int] = int(request.args["before"])
+    except Exception:
+        before_ts = None
+
     try:
-        conn = get_db()
-        total = conn.execute(
-            "SELECT COUNT(*) FROM workers_seen WHERE wallet=? AND active=1 AND last_seen>=?",
-            (wallet, now - timeout_s),
-        ).fetchone()[0]
-
-        rows = conn.execute(
-            "SELECT worker, last_seen FROM workers_seen "
-            "WHERE wallet=? AND active=1 AND last_seen>=? "
-            "ORDER BY last_seen DESC LIMIT ? OFFSET ?;",
-            (wallet, now - timeout_s, limit, offset),
-        ).fetchall()
-        try: conn.close()
-        except: pass
+        with db_conn() as conn:
+            # one index-backed pass: the window count replaces the separate
+            # COUNT(*) query (with a cursor it counts the remaining rows)
+            sql = ("SELECT worker, last_seen, COUNT(*) OVER () AS total "
+                   "FROM workers_seen WHERE wallet=? AND active=1 AND last_seen>=?")
+            params: List[Any] = [wallet, now - timeout_s]
+            if before_ts is not None:
+                sql += " AND last_seen<?"
+                params.append(before_ts)
+            sql += " ORDER BY last_seen DESC LIMIT ? OFFSET ?;"
+            params += [limit, offset]
+            rows = conn.execute(sql, params).fetchall()
+            if rows:
+                total = rows[0][2]
+            elif offset or before_ts is not None:
+                # page past the end: still report the real total
+                total = conn.execute(
+                    "SELECT COUNT(*) FROM workers_seen WHERE wallet=? AND active=1 AND last_seen>=?",
+                    (wallet, now - timeout_s),
+                ).fetchone()[0]
+            else:
+                total = 0
     except Exception:
         total = 0
         rows = []
@@ -723,26 +1144,19 @@ def api_history(addr: str):
     now = int(time.time())
     cutoff = now - max(60, window)
 
+    # Columnar payload: two flat arrays instead of one tuple per sample —
+    # fewer Python allocations here and fewer bytes on the wire.
     try:
-        conn = get_db()
-        rows = conn.execute(
-            "SELECT ts, hashrate FROM wallet_history WHERE wallet=? AND ts>=? ORDER BY ts ASC;",
-            (addr, cutoff)
-        ).fetchall()
-        try: conn.close()
-        except: pass
-        pts = [(int(r[0]), float(r[1] or 0.0)) for r in rows]
-        return jsonify({"wallet": addr, "points": pts})
+        with db_conn() as conn:
+            rows = conn.execute(
+                "SELECT ts, hashrate FROM wallet_history WHERE wallet=? AND ts>=? ORDER BY ts ASC;",
+                (addr, cutoff)
+            ).fetchall()
+        ts_col = [int(r[0]) for r in rows]
+        v_col = [float(r[1] or 0.0) for r in rows]
     except Exception:
-        pts = [(ts, v) for (ts, v) in HISTORY.get(addr, []) if ts >= cutoff]
-        return jsonify({"wallet": addr, "points": pts})
-
-@app.after_request
-def add_header(r):
-    r.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    r.headers["Pragma"] = "no-cache"
-    r.headers["Expires"] = "0"
-    return r
+        ts_col, v_col = _history_columns(addr, cutoff)
+    return jsonify({"wallet": addr, "ts": ts_col, "v": v_col})
 
 @app.route("/favicon.ico")
 def favicon():
@@ -752,12 +1166,16 @@ def favicon():
         return send_from_directory(path, "favicon.ico")
     return ("", 204)
 
+# Crawler endpoints serve constant bodies: robots.txt is baked at import,
+# the sitemap is rebuilt only when the lastmod date rolls over.
+_ROBOTS_BODY = b"User-agent: *\nAllow: /\nSitemap: https://xppool.in/sitemap.xml\n"
+
 @app.route("/robots.txt")
 def robots_txt():
-    return Response("User-agent: *\nAllow: /\nSitemap: https://xppool.in/sitemap.xml\n", mimetype="text/plain")
+    return Response(_ROBOTS_BODY, mimetype="text/plain")
 
-@app.route("/sitemap.xml")
-def sitemap_xml():
+@functools.lru_cache(maxsize=1)
+def _sitemap_body(lastmod: str) -> bytes:
     BASE_URL = "https://xppool.in"
     pages: List[tuple] = [
         ("/", "1.0"),
@@ -767,7 +1185,6 @@ def sitemap_xml():
         ("/about", "0.5"),
         ("/search", "0.5"),
     ]
-    lastmod = datetime.utcnow().date().isoformat()
     items = []
     for path, priority in pages:
         items.append(f"""
@@ -780,7 +1197,15 @@ def sitemap_xml():
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
 {''.join(items)}
 </urlset>"""
-    return Response(xml, mimetype="application/xml")
+    return xml.encode("utf-8")
+
+@app.route("/sitemap.xml")
+def sitemap_xml():
+    body = _sitemap_body(datetime.utcnow().date().isoformat())
+    return Response(body, mimetype="application/xml")
 
 if __name__ == "__main__":
-    app.run(host=PUBLIC_HOST, port=PUBLIC_PORT, debug=False)
+    # Dev convenience only — production runs gunicorn via wsgi.py
+    # (see Procfile / gunicorn.conf.py). Threaded so one handler can't
+    # serialize the whole dashboard even in dev.
+    app.run(host=PUBLIC_HOST, port=PUBLIC_PORT, debug=False, threaded=True)
@@ -0,0 +1,23 @@
+# gunicorn.conf.py — server config for the XP CKPool WebUI.
+#
+# Threaded workers replace the single-threaded Werkzeug dev server so one
+# slow handler (e.g. an RPC-heavy /api/node) no longer serializes every
+# other request.
+#
+# workers defaults to 1 on purpose: the snapshot, hashrate HISTORY and the
+# background refresh/sampler threads live in process memory, so extra
+# worker processes would each tail the ckpool log and diverge. Threads give
+# the concurrency; bump WEB_CONCURRENCY only if you know the state sharing
+# implications.
+import os
+
+bind = f"{os.getenv('PUBLIC_HOST', '0.0.0.0')}:{os.getenv('PUBLIC_PORT', '8088')}"
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+threads = int(os.getenv("WEB_THREADS", "16"))
+
+# recycle workers periodically to bound any slow leaks
+max_requests = 10000
+max_requests_jitter = 500
+
+graceful_timeout = 30
@@ -0,0 +1,3 @@
+#!/usr/bin/env python3
+# wsgi.py — WSGI entrypoint: gunicorn -c gunicorn.conf.py wsgi:app
+from app import app  # noqa: F401